@@ -1,7 +1,4 @@
+from .checksum import ChecksumTypes, pick_default_checksum  # noqa: F401
 from .dvuploader import DVUploader  # noqa: F401
 from .file import File  # noqa: F401
-from .utils import add_directory  # noqa: F401
-
-import nest_asyncio
-
-nest_asyncio.apply()
+from .utils import add_directory, hash_files_parallel  # noqa: F401
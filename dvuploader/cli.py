@@ -4,6 +4,17 @@ import typer
 from pydantic import BaseModel
 from typing import List, Optional
 from dvuploader import DVUploader, File
+from dvuploader.dvuploader import _install_uvloop
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 
 class CliInput(BaseModel):
@@ -33,7 +44,24 @@ def _parse_yaml_config(path: str) -> CliInput:
     Raises:
         ValueError: If the configuration file is invalid.
     """
-    return CliInput(**yaml.safe_load(open(path)))  # type: ignore
+    with open(path, "rb") as f:
+        content = f.read()
+
+    # JSON is a subset of YAML, but a JSON parser is considerably faster.
+    # Flow-style YAML starts with a bracket as well, hence it is parsed as
+    # YAML if it turns out not to be JSON.
+    data = None
+
+    if content.lstrip().startswith((b"{", b"[")):
+        try:
+            data = json_loads(content)
+        except ValueError:
+            pass
+
+    if data is None:
+        data = yaml.load(content, Loader=SafeLoader)
+
+    return CliInput(**data)  # type: ignore
 
 
 def _validate_inputs(
@@ -135,6 +163,8 @@ def main(
             files=[File(filepath=filepath) for filepath in filepaths],
         )
 
+    _install_uvloop()
+
     uploader = DVUploader(files=cli_input.files)
     uploader.upload(
         persistent_id=cli_input.persistent_id,
@@ -1,24 +1,55 @@
 import asyncio
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+import hashlib
 import httpx
-from io import BytesIO
-import json
 import os
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin
-import aiofiles
+import tenacity
+import threading
+import time
+import urllib.request
+from typing import AsyncGenerator, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from rich.progress import TaskID
 
 from dvuploader.file import File
-from dvuploader.utils import build_url
+from dvuploader.utils import build_limits, build_url
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json import dumps as json_dumps, loads as json_loads
 
 TESTING = bool(os.environ.get("DVUPLOADER_TESTING", False))
 MAX_FILE_DISPLAY = int(os.environ.get("DVUPLOADER_MAX_FILE_DISPLAY", 50))
 MAX_RETRIES = int(os.environ.get("DVUPLOADER_MAX_RETRIES", 10))
+MIN_RETRY_TIME = float(os.environ.get("DVUPLOADER_MIN_RETRY_TIME", 1.0))
+MAX_RETRY_TIME = float(os.environ.get("DVUPLOADER_MAX_RETRY_TIME", 60.0))
+CONNECT_TIMEOUT = float(os.environ.get("DVUPLOADER_CONNECT_TIMEOUT", 30.0))
+VERIFY_ETAGS = bool(os.environ.get("DVUPLOADER_VERIFY_ETAGS", False))
+CHUNK_READ_SIZE = int(os.environ.get("DVUPLOADER_READ_BUFFER", 2**20))
+
+# Prefetched tickets older than this are requested again before they are
+# used, since their presigned URLs expire (after 60 minutes by default)
+TICKET_MAX_AGE = float(os.environ.get("DVUPLOADER_TICKET_MAX_AGE", 300.0))
+
+# Cancelled uploads are aborted once within this time, since the caller
+# waits for the cancellation to finish
+ABORT_TIMEOUT = float(os.environ.get("DVUPLOADER_ABORT_TIMEOUT", 5.0))
+
+# Integer settings are validated by int() already, which raises a ValueError
+if CHUNK_READ_SIZE <= 0:
+    raise ValueError("DVUPLOADER_READ_BUFFER must be a positive integer")
 
-assert isinstance(
-    MAX_FILE_DISPLAY, int
-), "DVUPLOADER_MAX_FILE_DISPLAY must be an integer"
+# Serializes seek and read on platforms without os.pread
+_SEEK_LOCK = threading.Lock()
 
-assert isinstance(MAX_RETRIES, int), "DVUPLOADER_MAX_RETRIES must be an integer"
+# Serializes registration payloads without intermediate dictionaries
+_FILES_ADAPTER = TypeAdapter(List[File])
+
+# Responses indicating a temporary condition of the server or the store
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
 TICKET_ENDPOINT = "/api/datasets/:persistentId/uploadurls"
 ADD_FILE_ENDPOINT = "/api/datasets/:persistentId/addFiles"
@@ -34,6 +65,8 @@ async def direct_upload(
     progress,
     pbars,
     n_parallel_uploads: int,
+    pending_checksums: Optional[List[Future]] = None,
+    connection_limit: Optional[int] = None,
 ) -> None:
     """
     Perform parallel direct upload of files to the specified Dataverse repository.
@@ -45,77 +78,245 @@ async def direct_upload(
         persistent_id (str): The persistent identifier of the Dataverse dataset.
         progress: The progress object to track the upload progress.
         pbars: A list of progress bars to display the upload progress for each file.
-        n_parallel_uploads (int): The number of parallel uploads to perform.
+        n_parallel_uploads (int): The number of files and the number of chunks per file to upload in parallel.
+        pending_checksums (Optional[List[Future]]): Checksums computed in the background, awaited before the files are registered.
+        connection_limit (Optional[int]): The maximum number of connections to the store. Defaults to one per chunk in flight.
 
     Returns:
         None
     """
 
-    leave_bar = len(files) < MAX_FILE_DISPLAY
+    # Files in flight are limited by the workers, hence the connection pool
+    # only needs to be large enough for all of their chunks. The session
+    # is shared by all phases to reuse kept-alive connections. Dataverse
+    # endpoints are resolved against the base URL, while the presigned
+    # URLs of the store are absolute.
+    if connection_limit is None:
+        connection_limit = n_parallel_uploads**2
 
     session_params = {
-        "timeout": None,
-        "limits": httpx.Limits(max_connections=n_parallel_uploads),
+        "base_url": dataverse_url,
+        # Bodies and server responses may take arbitrarily long, but a
+        # connection that cannot be established is retried
+        "timeout": httpx.Timeout(None, connect=CONNECT_TIMEOUT),
+        "limits": build_limits(connection_limit),
+        # Dataverse API requests use a pool of their own, hence these
+        # never wait for connections occupied by uploads to the store
+        "mounts": {
+            _origin(dataverse_url): _api_transport(dataverse_url, n_parallel_uploads),
+        },
     }
 
     async with httpx.AsyncClient(**session_params) as session:
-        tasks = [
-            _upload_to_store(
-                session=session,
-                file=file,
-                dataverse_url=dataverse_url,
-                api_token=api_token,
-                persistent_id=persistent_id,
-                pbar=pbar,
-                progress=progress,
-                delay=0.0,
-                leave_bar=leave_bar,
+        # Workers share the iterator, hence only n_parallel_uploads
+        # files are in flight and only as many tasks exist at a time
+        pending = iter(zip(pbars, files))
+        upload_results = []
+        workers = [
+            asyncio.create_task(
+                _upload_worker(
+                    pending=pending,
+                    results=upload_results,
+                    session=session,
+                    api_token=api_token,
+                    persistent_id=persistent_id,
+                    progress=progress,
+                    n_parallel_uploads=n_parallel_uploads,
+                )
             )
-            for pbar, file in zip(pbars, files)
+            for _ in range(min(n_parallel_uploads, len(files)))
         ]
 
-        upload_results = await asyncio.gather(*tasks)
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # The files cannot be registered anymore, hence the remaining
+            # uploads are stopped instead of running until the session closes
+            for worker in workers:
+                worker.cancel()
 
-    for status, file in upload_results:
-        if status is True:
-            continue
+            await asyncio.gather(*workers, return_exceptions=True)
 
-        print(f"❌ Failed to upload file '{file.file_name}' to the S3 storage")
+            raise
 
-    headers = {
-        "X-Dataverse-key": api_token,
-        "x-amz-tagging": "dv-state=temp",
-    }
+        for status, file in upload_results:
+            if status is True:
+                continue
 
-    pbar = progress.add_task("╰── [bold white]Registering files", total=1)
+            print(f"❌ Failed to upload file '{file.file_name}' to the S3 storage")
 
-    session_params = {
-        "timeout": None,
-        "limits": httpx.Limits(max_connections=n_parallel_uploads),
-        "headers": headers,
-    }
+        if pending_checksums:
+            await asyncio.gather(*map(asyncio.wrap_future, pending_checksums))
+
+        pbar = progress.add_task("╰── [bold white]Registering files", total=1)
 
-    async with httpx.AsyncClient(**session_params) as session:
         await _add_files_to_ds(
             session=session,
             files=files,
-            dataverse_url=dataverse_url,
+            api_token=api_token,
             pid=persistent_id,
             progress=progress,
             pbar=pbar,
         )
 
 
+async def _upload_worker(
+    pending: Iterator[Tuple[TaskID, File]],
+    results: List[Tuple[bool, File]],
+    session: httpx.AsyncClient,
+    api_token: str,
+    persistent_id: str,
+    progress,
+    n_parallel_uploads: int,
+) -> None:
+    """
+    Uploads files taken from a shared iterator until it is exhausted.
+
+    Args:
+        pending (Iterator[Tuple[TaskID, File]]): The progress bars and files left to upload.
+        results (List[Tuple[bool, File]]): Collects the upload status of each file.
+        session (httpx.AsyncClient): The httpx async client session.
+        api_token (str): The API token to use for authentication.
+        persistent_id (str): The persistent identifier of the Dataverse dataset to upload to.
+        progress: The progress object.
+        n_parallel_uploads (int): The number of chunks to upload in parallel.
+    """
+
+    # The ticket of the next file is requested while the current file is
+    # uploaded, overlapping Dataverse round trips with storage transfers.
+    # Tickets are not fetched all up front, since presigned URLs expire.
+    upcoming = _next_ticket(pending, session, api_token, persistent_id)
+
+    try:
+        while upcoming is not None:
+            pbar, file, ticket_task, requested_at = upcoming
+            ticket = await ticket_task
+
+            # The ticket waited for the upload of the previous file, which
+            # may have taken long enough for its presigned URLs to expire
+            if time.monotonic() - requested_at > TICKET_MAX_AGE:
+                await _discard_ticket(session, ticket, api_token)
+                ticket = await _request_ticket(
+                    session=session,
+                    api_token=api_token,
+                    file_size=file._size,
+                    persistent_id=persistent_id,
+                )
+
+            upcoming = _next_ticket(pending, session, api_token, persistent_id)
+
+            results.append(
+                await _upload_to_store(
+                    session=session,
+                    file=file,
+                    ticket=ticket,
+                    api_token=api_token,
+                    pbar=pbar,
+                    progress=progress,
+                    n_parallel_uploads=n_parallel_uploads,
+                )
+            )
+    finally:
+        if upcoming is not None:
+            await _release_ticket(session, upcoming[2], api_token)
+
+
+def _next_ticket(
+    pending: Iterator[Tuple[TaskID, File]],
+    session: httpx.AsyncClient,
+    api_token: str,
+    persistent_id: str,
+) -> Optional[Tuple[TaskID, File, "asyncio.Task[Dict]", float]]:
+    """
+    Takes the next file from the shared iterator and starts requesting its ticket.
+
+    Args:
+        pending (Iterator[Tuple[TaskID, File]]): The progress bars and files left to upload.
+        session (httpx.AsyncClient): The httpx async client session.
+        api_token (str): The API token to use for authentication.
+        persistent_id (str): The persistent identifier of the Dataverse dataset to upload to.
+
+    Returns:
+        Optional[Tuple[TaskID, File, asyncio.Task, float]]: The progress bar, the file, the
+            running ticket request and the monotonic time it was started at, or None if no
+            files are left.
+    """
+
+    entry = next(pending, None)
+
+    if entry is None:
+        return None
+
+    pbar, file = entry
+    ticket_task = asyncio.ensure_future(
+        _request_ticket(
+            session=session,
+            api_token=api_token,
+            file_size=file._size,
+            persistent_id=persistent_id,
+        )
+    )
+
+    return pbar, file, ticket_task, time.monotonic()
+
+
+async def _release_ticket(
+    session: httpx.AsyncClient,
+    ticket_task: "asyncio.Future[Dict]",
+    api_token: str,
+) -> None:
+    """
+    Stops a prefetched ticket request that is not used anymore. If the ticket
+    has been issued already, it is discarded instead.
+
+    Args:
+        session (httpx.AsyncClient): The httpx async client session.
+        ticket_task (asyncio.Future[Dict]): The prefetched ticket request.
+        api_token (str): The API token to use for authentication.
+    """
+
+    # Cancelling has no effect on a finished request, whose ticket, error or
+    # cancellation is retrieved here, hence no exception goes unnoticed
+    ticket_task.cancel()
+    (ticket,) = await asyncio.gather(ticket_task, return_exceptions=True)
+
+    if isinstance(ticket, dict):
+        await _discard_ticket(session, ticket, api_token)
+
+
+async def _discard_ticket(
+    session: httpx.AsyncClient,
+    ticket: Dict,
+    api_token: str,
+) -> None:
+    """
+    Aborts the multipart upload started by an unused ticket, hence no parts
+    are left behind. Single-part tickets need no cleanup.
+
+    Args:
+        session (httpx.AsyncClient): The httpx async client session.
+        ticket (Dict): The ticket that is not used.
+        api_token (str): The API token to use for authentication.
+    """
+
+    if "abort" not in ticket:
+        return
+
+    try:
+        await _abort_upload(session=session, url=ticket["abort"], api_token=api_token)
+    except httpx.HTTPError:
+        # The upload itself is not affected, hence a failed cleanup is ignored
+        pass
+
+
 async def _upload_to_store(
     session: httpx.AsyncClient,
     file: File,
-    persistent_id: str,
-    dataverse_url: str,
+    ticket: Dict,
     api_token: str,
     pbar,
     progress,
-    delay: float,
-    leave_bar: bool,
+    n_parallel_uploads: int,
 ):
     """
     Uploads a file to a Dataverse collection using direct upload.
@@ -123,28 +324,16 @@ async def _upload_to_store(
     Args:
         session (httpx.AsyncClient): The httpx async client session.
         file (File): The file object to upload.
-        persistent_id (str): The persistent identifier of the Dataverse dataset to upload to.
-        dataverse_url (str): The URL of the Dataverse instance to upload to.
+        ticket (Dict): The upload ticket requested for the file.
         api_token (str): The API token to use for authentication.
         pbar: The progress bar object.
         progress: The progress object.
-        delay (float): The delay in seconds before starting the upload.
-        leave_bar (bool): A flag indicating whether to keep the progress bar visible after the upload is complete.
+        n_parallel_uploads (int): The number of chunks to upload in parallel.
 
     Returns:
         tuple: A tuple containing the upload status (bool) and the file object.
     """
 
-    await asyncio.sleep(delay)
-
-    ticket = await _request_ticket(
-        session=session,
-        dataverse_url=dataverse_url,
-        api_token=api_token,
-        file_size=file._size,
-        persistent_id=persistent_id,
-    )
-
     if "urls" not in ticket:
         status, storage_identifier = await _upload_singlepart(
             session=session,
@@ -152,8 +341,6 @@ async def _upload_to_store(
             file=file,
             pbar=pbar,
             progress=progress,
-            api_token=api_token,
-            leave_bar=leave_bar,
         )
 
     else:
@@ -161,10 +348,10 @@ async def _upload_to_store(
             session=session,
             response=ticket,
             file=file,
-            dataverse_url=dataverse_url,
             pbar=pbar,
             progress=progress,
             api_token=api_token,
+            n_parallel_uploads=n_parallel_uploads,
         )
 
     file.storageIdentifier = storage_identifier
@@ -172,9 +359,83 @@ async def _upload_to_store(
     return status, file
 
 
+def _origin(url: str) -> str:
+    """Returns the scheme, host and port of a URL as an httpx mount pattern."""
+
+    parsed = httpx.URL(url)
+
+    return f"{parsed.scheme}://{parsed.netloc.decode()}"
+
+
+def _api_transport(
+    dataverse_url: str,
+    n_parallel_uploads: int,
+) -> httpx.AsyncHTTPTransport:
+    """
+    Creates the transport for requests to the Dataverse API. Mounted transports
+    take precedence over the proxies httpx reads from the environment, hence the
+    proxy that applies to the Dataverse URL is set explicitly.
+
+    Args:
+        dataverse_url (str): The URL of the Dataverse repository.
+        n_parallel_uploads (int): The maximum number of connections to the API.
+
+    Returns:
+        httpx.AsyncHTTPTransport: The transport for the Dataverse API.
+    """
+
+    return httpx.AsyncHTTPTransport(
+        limits=build_limits(n_parallel_uploads),
+        proxy=_environment_proxy(dataverse_url),
+    )
+
+
+def _environment_proxy(url: str) -> Optional[str]:
+    """
+    Returns the proxy configured via HTTP(S)_PROXY, ALL_PROXY and NO_PROXY for a URL.
+
+    Args:
+        url (str): The URL to look up the proxy for.
+
+    Returns:
+        Optional[str]: The URL of the proxy, or None if the URL is not proxied.
+    """
+
+    parsed = httpx.URL(url)
+    proxies = urllib.request.getproxies()
+    proxy = proxies.get(parsed.scheme) or proxies.get("all")
+
+    if not proxy or urllib.request.proxy_bypass(parsed.host):
+        return None
+
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+def _is_transient_error(exception: BaseException) -> bool:
+    """Checks whether a failed request may succeed when it is sent again."""
+
+    if isinstance(exception, httpx.HTTPStatusError):
+        return exception.response.status_code in RETRY_STATUS_CODES
+
+    return isinstance(exception, httpx.TransportError)
+
+
+# Retries idempotent requests with exponentially growing, jittered waits
+_retry_transient = tenacity.retry(
+    wait=tenacity.wait_exponential_jitter(
+        initial=MIN_RETRY_TIME,
+        max=MAX_RETRY_TIME,
+        jitter=MIN_RETRY_TIME,
+    ),
+    stop=tenacity.stop_after_attempt(MAX_RETRIES),
+    retry=tenacity.retry_if_exception(_is_transient_error),
+    reraise=True,
+)
+
+
+@_retry_transient
 async def _request_ticket(
     session: httpx.AsyncClient,
-    dataverse_url: str,
     api_token: str,
     persistent_id: str,
     file_size: int,
@@ -187,7 +448,6 @@ async def _request_ticket(
 
     Args:
         session (httpx.AsyncClient): The httpx async client session to use for the request.
-        dataverse_url (str): The URL of the Dataverse installation.
         api_token (str): The API token used to access the dataset.
         persistent_id (str): The persistent identifier of the dataset of interest.
         file_size (int): The size of the file to be uploaded.
@@ -196,7 +456,7 @@ async def _request_ticket(
         Dict: The response from the Dataverse API, containing the ticket information.
     """
     url = build_url(
-        endpoint=urljoin(dataverse_url, TICKET_ENDPOINT),
+        endpoint=TICKET_ENDPOINT,
         key=api_token,
         persistentId=persistent_id,
         size=file_size,
@@ -205,20 +465,30 @@ async def _request_ticket(
     response = await session.get(url)
     response.raise_for_status()
 
-    return response.json()["data"]
+    ticket = json_loads(response.content)["data"]
+
+    if TESTING:
+        # Storage URLs are rewritten once here instead of per request
+        if "url" in ticket:
+            ticket["url"] = ticket["url"].replace("localstack", "localhost", 1)
+
+        for part, part_url in ticket.get("urls", {}).items():
+            ticket["urls"][part] = part_url.replace("localstack", "localhost", 1)
+
+    return ticket
 
 
+@_retry_transient
 async def _upload_singlepart(
     session: httpx.AsyncClient,
     ticket: Dict,
     file: File,
     pbar,
     progress,
-    api_token: str,
-    leave_bar: bool,
 ) -> Tuple[bool, str]:
     """
-    Uploads a single part of a file to a remote server using HTTP PUT method.
+    Uploads a file as a single part to a remote server using HTTP PUT method.
+    Files on disk are streamed, hence never read into memory as a whole.
 
     Args:
         session (httpx.AsyncClient): The httpx async client session used for the upload.
@@ -226,38 +496,63 @@ async def _upload_singlepart(
         filepath (str): The path to the file to be uploaded.
         pbar (tqdm): A progress bar object to track the upload progress.
         progress: The progress object used to update the progress bar.
-        leave_bar (bool): A flag indicating whether to keep the progress bar visible after the upload is complete.
 
     Returns:
         Tuple[bool, str]: A tuple containing the status of the upload (True for success, False for failure)
                           and the storage identifier of the uploaded file.
     """
-    assert "url" in ticket, "Couldn't find 'url'"
-
-    if TESTING:
-        ticket["url"] = ticket["url"].replace("localstack", "localhost", 1)
+    if "url" not in ticket:
+        raise KeyError("Couldn't find 'url'")
 
+    # The presigned URL authorizes the request, hence the API token is
+    # not sent to the store
     headers = {
-        "X-Dataverse-key": api_token,
         "x-amz-tagging": "dv-state=temp",
+        # S3 rejects chunked transfer encoding, hence the size is sent upfront
+        "Content-Length": str(file._size),
     }
+
     storage_identifier = ticket["storageIdentifier"]
     params = {
         "headers": headers,
         "url": ticket["url"],
-        "files": {"": file.handler},
     }
 
-    response = await session.put(**params)
-    response.raise_for_status()
+    sent = 0
+
+    def advance(n_bytes: int) -> None:
+        nonlocal sent
+        sent += n_bytes
+        progress.update(pbar, advance=n_bytes)
 
-    if response.status_code == 200:
+    try:
+        if file._from_disk:
+            with _open_for_reading(file.filepath) as fd:
+                # Streamed in blocks, which advance the progress bar
+                async with _aclosing(
+                    _read_chunk(
+                        fd=fd,
+                        offset=0,
+                        size=file._size,
+                        advance=advance,
+                    )
+                ) as content:
+                    params["content"] = content
+                    response = await session.put(**params)
+        else:
+            # Rewound, since a failed upload is sent again
+            file.handler.seek(0)  # type: ignore
+            params["content"] = file.handler.read()  # type: ignore
+            response = await session.put(**params)
+
+        response.raise_for_status()
+    except httpx.HTTPError:
+        # The file is sent again on retry, hence its progress is reverted
+        progress.update(pbar, advance=-sent)
+        raise
+
+    if response.status_code == 200 and not file._from_disk:
         progress.update(pbar, advance=file._size)
-        await asyncio.sleep(0.1)
-        progress.update(
-            pbar,
-            visible=leave_bar,
-        )
 
     return response.status_code == 200, storage_identifier
 
@@ -266,10 +561,10 @@ async def _upload_multipart(
     session: httpx.AsyncClient,
     response: Dict,
     file: File,
-    dataverse_url: str,
     pbar,
     progress,
     api_token: str,
+    n_parallel_uploads: int,
 ):
     """
     Uploads a file to Dataverse using multipart upload.
@@ -278,9 +573,9 @@ async def _upload_multipart(
         session (httpx.AsyncClient): The httpx async client session.
         response (Dict): The response from the Dataverse API containing the upload ticket information.
         file (File): The file object to be uploaded.
-        dataverse_url (str): The URL of the Dataverse instance.
         pbar (tqdm): A progress bar to track the upload progress.
         progress: The progress callback function.
+        n_parallel_uploads (int): The number of chunks to upload in parallel.
 
     Returns:
         Tuple[bool, str]: A tuple containing a boolean indicating the success of the upload and the storage identifier for the uploaded file.
@@ -291,9 +586,17 @@ async def _upload_multipart(
     abort = response["abort"]
     complete = response["complete"]
     part_size = response["partSize"]
-    urls = iter(response["urls"].values())
     storage_identifier = response["storageIdentifier"]
 
+    # Order by part number, since the ETags are completed in this order
+    urls = [
+        url
+        for _, url in sorted(
+            response["urls"].items(),
+            key=lambda item: int(item[0]),
+        )
+    ]
+
     # Chunk file and retrieve paths and urls
     chunk_size = int(part_size)
 
@@ -305,13 +608,21 @@ async def _upload_multipart(
             chunk_size=chunk_size,
             pbar=pbar,
             progress=progress,
+            n_parallel_uploads=n_parallel_uploads,
         )
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Cancelled uploads are aborted as well, hence no parts are left behind
+        await _abort_cancelled_upload(
+            session=session,
+            url=abort,
+            api_token=api_token,
+        )
+        raise
+    except BaseException as e:
         print(f"❌ Failed to upload file '{file.file_name}' to the S3 storage")
         await _abort_upload(
             session=session,
             url=abort,
-            dataverse_url=dataverse_url,
             api_token=api_token,
         )
         raise e
@@ -319,7 +630,6 @@ async def _upload_multipart(
     await _complete_upload(
         session=session,
         url=complete,
-        dataverse_url=dataverse_url,
         e_tags=e_tags,
         api_token=api_token,
     )
@@ -330,28 +640,33 @@ async def _upload_multipart(
 async def _chunked_upload(
     file: File,
     session: httpx.AsyncClient,
-    urls,
+    urls: List[str],
     chunk_size: int,
     pbar,
     progress,
+    n_parallel_uploads: int,
 ):
     """
     Uploads a file in chunks to multiple URLs using the provided session.
+    Chunks are uploaded concurrently, at most n_parallel_uploads at a time.
 
     Args:
         file (File): The file object to upload.
         session (httpx.AsyncClient): The httpx async client session to use for the upload.
-        urls: An iterable of URLs to upload the file chunks to.
+        urls (List[str]): The URLs to upload the file chunks to, ordered by part number.
         chunk_size (int): The size of each chunk in bytes.
         pbar (tqdm): The progress bar to update during the upload.
         progress: The progress object to track the upload progress.
+        n_parallel_uploads (int): The number of chunks to upload in parallel.
 
     Returns:
         List[str]: A list of ETags returned by the server for each uploaded chunk.
+
+    Raises:
+        ValueError: If the number of URLs does not match the number of chunks.
     """
-    e_tags = []
 
-    if not os.path.exists(file.filepath):
+    if not file._from_disk:
         raise NotImplementedError(
             """
 
@@ -360,82 +675,264 @@ async def _chunked_upload(
             """
         )
 
-    async with aiofiles.open(file.filepath, "rb") as f:
-        chunk = await f.read(chunk_size)
-        e_tags.append(
-            await _upload_chunk(
-                session=session,
-                url=next(urls),
-                file=BytesIO(chunk),
-            )
+    semaphore = asyncio.BoundedSemaphore(n_parallel_uploads)
+    offsets = range(0, file._size, chunk_size)
+
+    # Unmatched chunks would otherwise be dropped, completing a truncated file
+    if len(urls) != len(offsets):
+        raise ValueError(
+            f"Ticket of file '{file.file_name}' provides {len(urls)} part URLs, "
+            f"but the file consists of {len(offsets)} parts."
         )
 
-        progress.update(pbar, advance=len(chunk))
+    # All chunks read from a single descriptor at their own offset
+    with _open_for_reading(file.filepath) as fd:
+        tasks = [
+            asyncio.create_task(
+                _upload_chunk(
+                    session=session,
+                    url=url,
+                    fd=fd,
+                    offset=offset,
+                    size=min(chunk_size, file._size - offset),
+                    pbar=pbar,
+                    progress=progress,
+                    semaphore=semaphore,
+                )
+            )
+            for url, offset in zip(urls, offsets)
+        ]
 
-        while chunk:
-            chunk = await f.read(chunk_size)
-            progress.update(pbar, advance=len(chunk))
+        try:
+            # Results of gather keep the order of the tasks, hence of the parts
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the remaining chunks before the upload is aborted
+            for task in tasks:
+                task.cancel()
 
-            if not chunk:
-                break
-            else:
-                e_tags.append(
-                    await _upload_chunk(
-                        session=session,
-                        url=next(urls),
-                        file=BytesIO(chunk),
-                    )
-                )
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-    return e_tags
+            raise
 
 
 def _validate_ticket_response(response: Dict) -> None:
-    """Validate the response from the ticket request to include all necessary fields."""
+    """
+    Validate the response from the ticket request to include all necessary fields.
+
+    Raises:
+        KeyError: If a field is missing from the response.
+    """
 
-    assert "abort" in response, "Couldn't find 'abort'"
-    assert "complete" in response, "Couldn't find 'complete'"
-    assert "partSize" in response, "Couldn't find 'partSize'"
-    assert "urls" in response, "Couldn't find 'urls'"
-    assert "storageIdentifier" in response, "Could not find 'storageIdentifier'"
+    for field in ("abort", "complete", "partSize", "urls", "storageIdentifier"):
+        if field not in response:
+            raise KeyError(f"Couldn't find '{field}'")
 
 
+@_retry_transient
 async def _upload_chunk(
     session: httpx.AsyncClient,
     url: str,
-    file: BytesIO,
+    fd: int,
+    offset: int,
+    size: int,
+    pbar,
+    progress,
+    semaphore: asyncio.Semaphore,
 ):
     """
-    Uploads a chunk of data to the specified URL using the provided session.
+    Uploads a chunk of a file to the specified URL using the provided session.
+    The chunk is streamed from disk, hence only a small buffer is held in memory.
 
     Args:
         session (httpx.AsyncClient): The session to use for the upload.
         url (str): The URL to upload the chunk to.
-        file (ChunkStream): The chunk of data to upload.
+        fd (int): The file descriptor of the file to upload the chunk of.
+        offset (int): The position of the chunk within the file in bytes.
+        size (int): The size of the chunk in bytes.
         pbar: The progress bar to update during the upload.
+        progress: The progress object to track the upload progress.
+        semaphore (asyncio.Semaphore): Limits the number of chunks uploaded at once.
 
     Returns:
         str: The ETag value of the uploaded chunk.
     """
 
-    if TESTING:
-        url = url.replace("localstack", "localhost", 1)
+    sent = 0
+    digest = hashlib.md5(usedforsecurity=False) if VERIFY_ETAGS else None
 
+    def advance(n_bytes: int) -> None:
+        nonlocal sent
+        sent += n_bytes
+        progress.update(pbar, advance=n_bytes)
+
+    content = _read_chunk(
+        fd=fd,
+        offset=offset,
+        size=size,
+        advance=advance,
+        digest=digest,
+    )
     params = {
         "url": url,
-        "data": file,
+        "content": content,
+        # S3 rejects chunked transfer encoding, hence the size is sent upfront
+        "headers": {"Content-Length": str(size)},
     }
 
-    response = await session.put(**params)
-    response.raise_for_status()
+    try:
+        async with semaphore, _aclosing(content):
+            response = await session.put(**params)
+
+        response.raise_for_status()
+    except httpx.HTTPError:
+        # The chunk is sent again on retry, hence its progress is reverted
+        progress.update(pbar, advance=-sent)
+        raise
+
+    e_tag = response.headers.get("ETag")
+
+    if digest is not None:
+        _verify_e_tag(e_tag, digest)
 
-    return response.headers.get("ETag")
+    return e_tag
 
 
+def _verify_e_tag(e_tag: Optional[str], digest) -> None:
+    """
+    Compares the ETag of an uploaded part with the MD5 of the bytes sent.
+
+    Args:
+        e_tag (Optional[str]): The ETag returned by the store.
+        digest: The MD5 hash object updated with the bytes of the part.
+
+    Raises:
+        ValueError: If the ETag does not match the MD5 of the part.
+    """
+
+    if e_tag is None or e_tag.strip('"') != digest.hexdigest():
+        raise ValueError(
+            f"ETag {e_tag} of the uploaded part does not match its MD5 {digest.hexdigest()}."
+        )
+
+
+async def _read_chunk(
+    fd: int,
+    offset: int,
+    size: int,
+    advance: Callable[[int], None],
+    digest=None,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Reads a chunk of a file in blocks of CHUNK_READ_SIZE bytes. Blocks are
+    read at their position, hence chunks may share a file descriptor. The
+    next block is read ahead while the current one is sent.
+
+    Args:
+        fd (int): The file descriptor of the file to read.
+        offset (int): The position of the chunk within the file in bytes.
+        size (int): The size of the chunk in bytes.
+        advance (Callable[[int], None]): Called with the size of each block read.
+        digest: Optional hash object, updated with each block in the reading thread.
+
+    Yields:
+        bytes: The next block of the chunk.
+    """
+
+    def read_ahead(offset: int, size: int) -> Optional["asyncio.Future[bytes]"]:
+        if size <= 0:
+            return None
+
+        return asyncio.ensure_future(
+            asyncio.to_thread(
+                _read_block,
+                fd,
+                min(CHUNK_READ_SIZE, size),
+                offset,
+                digest,
+            )
+        )
+
+    pending = read_ahead(offset, size)
+
+    try:
+        while pending is not None:
+            data = await pending
+
+            if not data:
+                break
+
+            offset += len(data)
+            size -= len(data)
+
+            # Blocks are read one after another, hence the digest stays in order
+            pending = read_ahead(offset, size)
+            advance(len(data))
+
+            yield data
+    finally:
+        if pending is not None:
+            # A read in progress cannot be interrupted, hence it is waited
+            # for, since the file descriptor may be closed afterwards
+            await asyncio.wait({pending})
+
+            if not pending.cancelled():
+                pending.exception()
+
+
+@asynccontextmanager
+async def _aclosing(agen: AsyncGenerator) -> AsyncIterator[AsyncGenerator]:
+    """
+    Closes an async generator on exit, hence its cleanup runs before the
+    resources it uses are released. Equivalent to contextlib.aclosing,
+    which is not available before Python 3.10.
+    """
+
+    try:
+        yield agen
+    finally:
+        await agen.aclose()
+
+
+@contextmanager
+def _open_for_reading(filepath: str) -> Iterator[int]:
+    """Opens a file unbuffered and yields its file descriptor."""
+
+    fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+
+def _read_block(fd: int, size: int, offset: int, digest=None) -> bytes:
+    """Reads a block and hashes it, hence both run outside the event loop."""
+
+    data = _pread(fd, size, offset)
+
+    if digest is not None:
+        digest.update(data)
+
+    return data
+
+
+def _pread(fd: int, size: int, offset: int) -> bytes:
+    """Reads up to size bytes at offset without relying on the file position."""
+
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+
+    # os.pread is not available on Windows, hence seek and read are paired
+    with _SEEK_LOCK:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+
+@_retry_transient
 async def _complete_upload(
     session: httpx.AsyncClient,
     url: str,
-    dataverse_url: str,
     e_tags: List[Optional[str]],
     api_token: str,
 ) -> None:
@@ -444,18 +941,17 @@ async def _complete_upload(
     Args:
         session (httpx.AsyncClient): The aiohttp client session.
         url (str): The URL to send the PUT request to.
-        dataverse_url (str): The base URL of the Dataverse instance.
         e_tags (List[str]): The list of E tags to send in the payload.
 
     Raises:
         aiohttp.ClientResponseError: If the response status code is not successful.
     """
 
-    payload = json.dumps({str(index + 1): e_tag for index, e_tag in enumerate(e_tags)})
+    payload = json_dumps({str(part): e_tag for part, e_tag in enumerate(e_tags, 1)})
 
     params = {
-        "url": urljoin(dataverse_url, url),
-        "data": payload,
+        "url": url,
+        "content": payload,
         "headers": {
             "X-Dataverse-key": api_token,
         },
@@ -465,10 +961,10 @@ async def _complete_upload(
     response.raise_for_status()
 
 
+@_retry_transient
 async def _abort_upload(
     session: httpx.AsyncClient,
     url: str,
-    dataverse_url: str,
     api_token: str,
 ):
     """
@@ -477,7 +973,6 @@ async def _abort_upload(
     Args:
         session (httpx.AsyncClient): The httpx async client session.
         url (str): The URL to send the DELETE request to.
-        dataverse_url (str): The base URL of the Dataverse instance.
         api_token (str): The API token to use for the request.
 
     Raises:
@@ -486,14 +981,44 @@ async def _abort_upload(
 
     headers = {"X-Dataverse-key": api_token}
 
-    url = urljoin(dataverse_url, url)
     response = await session.delete(url, headers=headers)
     response.raise_for_status()
 
 
+async def _abort_cancelled_upload(
+    session: httpx.AsyncClient,
+    url: str,
+    api_token: str,
+):
+    """
+    Aborts an upload whose task has been cancelled. The request is sent once
+    and given at most ABORT_TIMEOUT seconds, hence the cancellation is not
+    held up by retries. A failed abort leaves the parts to the store.
+
+    Args:
+        session (httpx.AsyncClient): The httpx async client session.
+        url (str): The URL to send the DELETE request to.
+        api_token (str): The API token to use for the request.
+    """
+
+    abort_once = _abort_upload.retry_with(stop=tenacity.stop_after_attempt(1))  # type: ignore
+    request = asyncio.ensure_future(
+        asyncio.wait_for(
+            abort_once(session=session, url=url, api_token=api_token),
+            timeout=ABORT_TIMEOUT,
+        )
+    )
+
+    try:
+        # Shielded, hence a repeated cancellation does not interrupt the abort
+        await asyncio.shield(request)
+    except (httpx.HTTPError, asyncio.TimeoutError):
+        pass
+
+
 async def _add_files_to_ds(
     session: httpx.AsyncClient,
-    dataverse_url: str,
+    api_token: str,
     pid: str,
     files: List[File],
     progress,
@@ -504,7 +1029,7 @@ async def _add_files_to_ds(
 
     Args:
         session (httpx.AsyncClient): The httpx async client session.
-        dataverse_url (str): The URL of the Dataverse instance.
+        api_token (str): The API token to use for authentication.
         pid (str): The persistent identifier of the dataset.
         file (File): The file to be added.
 
@@ -512,63 +1037,72 @@ async def _add_files_to_ds(
         bool: True if the file was added successfully, False otherwise.
     """
 
-    novel_url = urljoin(dataverse_url, UPLOAD_ENDPOINT + pid)
-    replace_url = urljoin(dataverse_url, REPLACE_ENDPOINT + pid)
+    novel_url = UPLOAD_ENDPOINT + pid
+    replace_url = REPLACE_ENDPOINT + pid
 
-    novel_json_data = _prepare_registration(files, use_replace=False)
-    replace_json_data = _prepare_registration(files, use_replace=True)
+    headers = {"X-Dataverse-key": api_token}
+    novel_files, replace_files = [], []
 
-    await _multipart_json_data_request(
-        session=session,
-        json_data=novel_json_data,
-        url=novel_url,
-    )
+    for file in files:
+        (replace_files if file.to_replace else novel_files).append(file)
 
-    await _multipart_json_data_request(
-        session=session,
-        json_data=replace_json_data,
-        url=replace_url,
-    )
+    # Empty lists are not sent, saving a round trip to Dataverse
+    if novel_files:
+        await _multipart_json_data_request(
+            session=session,
+            json_data=_prepare_registration(novel_files, use_replace=False),
+            url=novel_url,
+            headers=headers,
+        )
+
+    if replace_files:
+        await _multipart_json_data_request(
+            session=session,
+            json_data=_prepare_registration(replace_files, use_replace=True),
+            url=replace_url,
+            headers=headers,
+        )
 
     progress.update(pbar, advance=1)
 
 
-def _prepare_registration(files: List[File], use_replace: bool) -> List[Dict]:
+def _prepare_registration(files: List[File], use_replace: bool) -> bytes:
     """
-    Prepares the files for registration at the Dataverse instance.
+    Prepares the files for registration at the Dataverse instance. The files
+    are serialized to JSON in a single pass, without intermediate dictionaries.
 
     Args:
-        files (List[File]): The list of files to prepare.
+        files (List[File]): The files to prepare, all either new or to be replaced.
+        use_replace (bool): Whether the files replace existing ones.
 
     Returns:
-        List[Dict]: The list of files prepared for registration.
+        bytes: The JSON array of files prepared for registration.
     """
 
     exclude = {"to_replace"} if use_replace else {"to_replace", "file_id"}
 
-    return [
-        file.model_dump(
-            by_alias=True,
-            exclude=exclude,
-            exclude_none=True,
-        )
-        for file in files
-        if file.to_replace is use_replace
-    ]
+    return _FILES_ADAPTER.dump_json(
+        files,
+        by_alias=True,
+        exclude={"__all__": exclude},
+        exclude_none=True,
+    )
 
 
 async def _multipart_json_data_request(
-    json_data: List[Dict],
+    json_data: bytes,
     url: str,
     session: httpx.AsyncClient,
+    headers: Dict[str, str],
 ):
     """
     Sends a multipart/form-data POST request with JSON data to the specified URL using the provided session.
 
     Args:
-        json_data (str): The JSON data to be sent in the request body.
+        json_data (bytes): The JSON data to be sent in the request body.
         url (str): The URL to send the request to.
         session (httpx.AsyncClient): The httpx async client session to use for the request.
+        headers (Dict[str, str]): The headers to send with the request.
 
     Raises:
         httpx.HTTPStatusError: If the response status code is not successful.
@@ -580,10 +1114,10 @@ async def _multipart_json_data_request(
     files = {
         "jsonData": (
             None,
-            BytesIO(json.dumps(json_data).encode()),
+            json_data,
             "application/json",
         ),
     }
 
-    response = await session.post(url, files=files)
+    response = await session.post(url, files=files, headers=headers)
     response.raise_for_status()
@@ -1,4 +1,6 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from urllib.parse import urljoin
 import httpx
 import os
@@ -6,18 +8,31 @@ import rich
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel
-from rich.progress import Progress, TaskID
+from rich.progress import Progress
 from rich.table import Table
 from rich.console import Console
 from rich.panel import Panel
 
+from dvuploader.checksum import ChecksumTypes, pick_default_checksum
 from dvuploader.directupload import (
+    MAX_FILE_DISPLAY,
     TICKET_ENDPOINT,
     direct_upload,
 )
 from dvuploader.file import File
+from dvuploader.hashcache import HashCache
 from dvuploader.nativeupload import native_upload
-from dvuploader.utils import build_url, retrieve_dataset_files, setup_pbar
+from dvuploader.utils import (
+    _hash_file,
+    build_url,
+    hash_files_parallel,
+    retrieve_dataset_files,
+    setup_pbar,
+)
+
+NEST_ASYNCIO = bool(os.environ.get("DVUPLOADER_NEST_ASYNCIO", False))
+USE_HASH_CACHE = bool(os.environ.get("DVUPLOADER_HASH_CACHE", False))
+USE_UVLOOP = bool(os.environ.get("DVUPLOADER_USE_UVLOOP", False))
 
 
 class DVUploader(BaseModel):
@@ -57,6 +72,11 @@ class DVUploader(BaseModel):
             None
         """
 
+        _apply_nest_asyncio()
+
+        if USE_UVLOOP:
+            _install_uvloop()
+
         if self.verbose:
             print("\n")
 
@@ -77,15 +97,25 @@ class DVUploader(BaseModel):
         if self.verbose:
             rich.print(panel)
 
-        asyncio.run(self._validate_and_hash_files(verbose=self.verbose))
-
-        # Check for duplicates
-        self._check_duplicates(
+        ds_files = retrieve_dataset_files(
             dataverse_url=dataverse_url,
             persistent_id=persistent_id,
             api_token=api_token,
         )
 
+        for file in self.files:
+            file.extract_file_name()
+
+        self._set_checksum_types(ds_files)
+
+        self._validate_and_hash_files(
+            files=self._files_to_prehash(ds_files),
+            verbose=self.verbose,
+        )
+
+        # Check for duplicates
+        self._check_duplicates(ds_files=ds_files)
+
         # Sort files by size
         files = sorted(
             self.files,
@@ -115,6 +145,8 @@ class DVUploader(BaseModel):
         progress, pbars = self.setup_progress_bars(files=files)
 
         if not has_direct_upload or force_native:
+            # Checksums are not part of native uploads, thus the
+            # remaining files do not need to be hashed at all
             with progress:
                 asyncio.run(
                     native_upload(
@@ -128,94 +160,144 @@ class DVUploader(BaseModel):
                     )
                 )
         else:
-            with progress:
-                asyncio.run(
-                    direct_upload(
-                        files=files,
-                        dataverse_url=dataverse_url,
-                        api_token=api_token,
-                        persistent_id=persistent_id,
-                        pbars=pbars,
-                        progress=progress,
-                        n_parallel_uploads=n_parallel_uploads,
-                    )
-                )
+            # Remaining files are hashed while being uploaded and the
+            # checksums are awaited before the files are registered. The
+            # pool is sized like the one of hash_files_parallel, since its
+            # reads compete with the reads of the upload itself.
+            executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+            with _open_hash_cache() as cache:
+                try:
+                    pending_checksums = [
+                        executor.submit(_hash_file, file, cache)
+                        for file in files
+                        if file.checksum is None
+                    ]
+
+                    with progress:
+                        asyncio.run(
+                            direct_upload(
+                                files=files,
+                                dataverse_url=dataverse_url,
+                                api_token=api_token,
+                                persistent_id=persistent_id,
+                                pbars=pbars,
+                                progress=progress,
+                                n_parallel_uploads=n_parallel_uploads,
+                                pending_checksums=pending_checksums,
+                            )
+                        )
+                finally:
+                    # Checksums are awaited by a successful upload, hence only
+                    # those of a failed one are left and need not be computed.
+                    # Running ones still use the cache and are waited for
+                    # before it is closed.
+                    executor.shutdown(wait=True, cancel_futures=True)
 
         if self.verbose:
             rich.print("\n[bold italic white]✅ Upload complete\n")
 
-    async def _validate_and_hash_files(self, verbose: bool):
+    def _validate_and_hash_files(self, files: List[File], verbose: bool):
         """
-        Validates and hashes the files to be uploaded.
+        Validates and hashes the given files in parallel. If DVUPLOADER_HASH_CACHE
+        is set, checksums of unchanged files are taken from the local hash cache.
+
+        Args:
+            files (List[File]): The files to validate and hash.
+            verbose (bool): Whether to display the progress.
 
         Returns:
             None
         """
 
-        if not verbose:
-            tasks = [
-                self._validate_and_hash_file(file=file, verbose=self.verbose)
-                for file in self.files
-            ]
-
-            await asyncio.gather(*tasks)
-            return
+        with _open_hash_cache() as cache:
+            if not verbose:
+                hash_files_parallel(files, cache=cache)
+                return
 
-        print("\n")
+            print("\n")
 
-        progress = Progress()
-        task = progress.add_task(
-            "[bold italic white]\n📦 Preparing upload[/bold italic white]",
-            total=len(self.files),
-        )
+            progress = Progress()
+            task = progress.add_task(
+                "[bold italic white]\n📦 Preparing upload[/bold italic white]",
+                total=len(files),
+            )
 
-        with progress:
-            tasks = [
-                self._validate_and_hash_file(
-                    file=file, progress=progress, task_id=task, verbose=self.verbose
+            with progress:
+                hash_files_parallel(
+                    files,
+                    callback=lambda _: progress.update(task, advance=1),
+                    cache=cache,
                 )
-                for file in self.files
-            ]
 
-            await asyncio.gather(*tasks)
+            print("\n")
+
+    def _files_to_prehash(self, ds_files: List[Dict]) -> List[File]:
+        """
+        Returns the files that need to be hashed before the upload. Only files
+        whose path already exists in the dataset can be skipped as duplicates.
+        In-memory handlers are shared with the upload and are cheap to hash,
+        hence these are hashed up front as well.
 
-        print("\n")
+        Parameters:
+            ds_files (List[Dict]): List of dictionary objects representing dataset files.
 
-    @staticmethod
-    async def _validate_and_hash_file(
-        file: File,
-        verbose: bool,
-        progress: Optional[Progress] = None,
-        task_id: Optional[TaskID] = None,
-    ):
-        file.extract_file_name_hash_file()
+        Returns:
+            List[File]: The files to hash before the upload.
+        """
 
-        if verbose:
-            progress.update(task_id, advance=1)  # type: ignore
+        ds_paths = {
+            os.path.join(ds_file.get("directoryLabel", ""), ds_file["label"])
+            for ds_file in ds_files
+        }
 
-    def _check_duplicates(
-        self,
-        dataverse_url: str,
-        persistent_id: str,
-        api_token: str,
-    ):
+        return [
+            file
+            for file in self.files
+            if not file._from_disk
+            or os.path.join(file.directory_label, file.file_name) in ds_paths  # type: ignore
+        ]
+
+    def _set_checksum_types(self, ds_files: List[Dict]):
+        """
+        Sets the checksum type of files without an explicit one. Files that
+        replace a dataset file use the type of that file, so their checksums
+        stay comparable to the ones the server reports. New files use the
+        preferred type among those already used in the dataset.
+
+        Parameters:
+            ds_files (List[Dict]): List of dictionary objects representing dataset files.
+        """
+
+        known_types = {checksum_type.value[0]: checksum_type for checksum_type in ChecksumTypes}
+        existing_types = {}
+
+        for ds_file in ds_files:
+            if "checksum" in ds_file["dataFile"]:
+                dspath = os.path.join(ds_file.get("directoryLabel", ""), ds_file["label"])
+                existing_types[dspath] = ds_file["dataFile"]["checksum"]["type"]
+
+        default_type = pick_default_checksum(set(existing_types.values()))
+
+        for file in self.files:
+            if "checksum_type" in file.model_fields_set:
+                continue
+
+            fpath = os.path.join(file.directory_label, file.file_name)  # type: ignore
+            file.checksum_type = known_types.get(
+                existing_types.get(fpath, ""), default_type
+            )
+
+    def _check_duplicates(self, ds_files: List[Dict]):
         """
         Checks for duplicate files in the dataset by comparing the checksums.
 
         Parameters:
-            dataverse_url (str): The URL of the dataverse.
-            persistent_id (str): The persistent ID of the dataset.
-            api_token (str): The API token for accessing the dataverse.
+            ds_files (List[Dict]): List of dictionary objects representing dataset files.
 
         Prints a message for each file that already exists in the dataset with the same checksum.
         """
 
-        ds_files = retrieve_dataset_files(
-            dataverse_url=dataverse_url,
-            persistent_id=persistent_id,
-            api_token=api_token,
-        )
-
         table = Table(
             title="[bold white]🔎 Checking dataset files",
             title_justify="left",
@@ -345,13 +427,24 @@ class DVUploader(BaseModel):
 
     def setup_progress_bars(self, files: List[File]):
         """
-        Sets up progress bars for each file in the uploader.
+        Sets up progress bars for each file in the uploader. From
+        DVUPLOADER_MAX_FILE_DISPLAY files on, a single bar tracks the
+        bytes of all files instead.
 
         Returns:
             A list of progress bars, one for each file in the uploader.
         """
 
         progress = Progress()
+
+        if len(files) >= MAX_FILE_DISPLAY:
+            task = progress.add_task(
+                f"[pink]├── {len(files)} files",
+                total=sum(file._size for file in files),
+            )
+
+            return progress, [task] * len(files)
+
         tasks = [
             setup_pbar(
                 file=file,
@@ -361,3 +454,56 @@ class DVUploader(BaseModel):
         ]
 
         return progress, tasks
+
+
+def _apply_nest_asyncio():
+    """
+    Patches asyncio to allow nested event loops, which is required to run the
+    upload from within an already running loop (e.g. Jupyter). The patch
+    slows down every event loop in the process, hence it is only applied
+    when needed or when DVUPLOADER_NEST_ASYNCIO is set.
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if not NEST_ASYNCIO:
+            return
+
+    import nest_asyncio
+
+    nest_asyncio.apply()
+
+
+def _install_uvloop() -> None:
+    """
+    Installs the uvloop event loop policy if available. uvloop schedules
+    tasks considerably faster than the default loop, which pays off with
+    many parallel uploads. The command line interface always installs it,
+    while library users opt in via DVUPLOADER_USE_UVLOOP, since the policy
+    applies to the whole process. nest_asyncio cannot patch uvloop, hence
+    the default loop is kept if DVUPLOADER_NEST_ASYNCIO is set or a loop
+    is already running.
+    """
+
+    if NEST_ASYNCIO:
+        return
+
+    try:
+        asyncio.get_running_loop()
+        return
+    except RuntimeError:
+        pass
+
+    try:
+        import uvloop
+    except ImportError:
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def _open_hash_cache():
+    """Opens the local hash cache if DVUPLOADER_HASH_CACHE is set."""
+
+    return HashCache() if USE_HASH_CACHE else nullcontext()
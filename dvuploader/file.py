@@ -1,11 +1,13 @@
 from io import BytesIO, StringIO
 import os
+from stat import S_ISREG
 from typing import List, Optional, Union, IO
 
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.fields import PrivateAttr
 
 from dvuploader.checksum import Checksum, ChecksumTypes
+from dvuploader.hashcache import HashCache
 
 
 class File(BaseModel):
@@ -28,7 +30,9 @@ class File(BaseModel):
 
     Methods:
         _validate_filepath(path): Validates if the file path exists and is a file.
-        _extract_file_name_hash_file(): Extracts the file_name from the filepath and calculates the file's checksum.
+        extract_file_name_hash_file(): Extracts the file_name from the filepath and calculates the file's checksum.
+        extract_file_name(): Extracts the file_name and size from the filepath without hashing.
+        hash_file(): Calculates the file's checksum.
 
     """
 
@@ -44,7 +48,7 @@ class File(BaseModel):
     mimeType: str = "text/plain"
     categories: List[str] = ["DATA"]
     restrict: bool = False
-    checksum_type: ChecksumTypes = Field(default=ChecksumTypes.MD5, exclude=True)
+    checksum_type: ChecksumTypes = Field(default=ChecksumTypes.SHA256, exclude=True)
     storageIdentifier: Optional[str] = None
     file_name: Optional[str] = Field(default=None, alias="fileName")
     checksum: Optional[Checksum] = None
@@ -52,23 +56,92 @@ class File(BaseModel):
     file_id: Optional[Union[str, int]] = Field(default=None, alias="fileToReplaceId")
 
     _size: int = PrivateAttr(default=0)
+    _from_disk: bool = PrivateAttr(default=False)
 
-    def extract_file_name_hash_file(self):
+    def extract_file_name_hash_file(self, cache: Optional[HashCache] = None):
         """
         Extracts the file_name and calculates the hash of the file.
 
+        Args:
+            cache (Optional[HashCache]): Cache to look up and store the checksum of files read from disk.
+
+        Returns:
+            self: The current instance of the class.
+        """
+
+        self.extract_file_name()
+        self.hash_file(cache=cache)
+
+        return self
+
+    def hash_file(self, cache: Optional[HashCache] = None):
+        """
+        Calculates the hash of the file. Files on disk are read through a
+        separate handler, hence the file may be hashed while it is uploaded.
+
+        Args:
+            cache (Optional[HashCache]): Cache to look up and store the checksum of files read from disk.
+
         Returns:
             self: The current instance of the class.
         """
 
-        # Hash file
         hash_algo, hash_fun = self.checksum_type.value
 
+        if not self._from_disk:
+            self.checksum = Checksum.from_file(
+                handler=self.handler,  # type: ignore
+                hash_fun=hash_fun,
+                hash_algo=hash_algo,
+            )
+
+            return self
+
+        with open(self.filepath, "rb") as handler:
+            if cache is not None:
+                stat = os.fstat(handler.fileno())
+                cache_key = {
+                    "path": os.path.abspath(self.filepath),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "hash_algo": hash_algo,
+                }
+
+                value = cache.get(**cache_key)
+
+                if value is not None:
+                    self.checksum = Checksum(type=hash_algo, value=value)  # type: ignore
+                    return self
+
+            self.checksum = Checksum.from_file(
+                handler=handler,
+                hash_fun=hash_fun,
+                hash_algo=hash_algo,
+            )
+
+        if cache is not None:
+            cache.put(value=self.checksum.value, **cache_key)
+
+        return self
+
+    def extract_file_name(self):
+        """
+        Opens the file and extracts its file_name and size without hashing it.
+
+        Returns:
+            self: The current instance of the class.
+        """
+
         if self.handler is None:
-            self._validate_filepath(self.filepath)
+            stat = self._validate_filepath(self.filepath)
             self.handler = open(self.filepath, "rb")
-            self._size = os.path.getsize(self.filepath)
-        else:
+            self._size = stat.st_size
+            self._from_disk = True
+        elif not self._from_disk:
+            if isinstance(self.handler, StringIO):
+                # Checksums are computed on binary handlers only
+                self.handler = BytesIO(self.handler.read().encode())
+
             self._size = len(self.handler.read())
             self.directory_label = os.path.dirname(self.filepath)
             self.handler.seek(0)
@@ -76,27 +149,29 @@ class File(BaseModel):
         if self.file_name is None:
             self.file_name = os.path.basename(self.filepath)
 
-        self.checksum = Checksum.from_file(
-            handler=self.handler,
-            hash_fun=hash_fun,
-            hash_algo=hash_algo,
-        )
-
         return self
 
     @staticmethod
-    def _validate_filepath(path):
+    def _validate_filepath(path) -> os.stat_result:
         """
         Validates if the given filepath exists and is a file.
 
         Args:
             path (str): The filepath to be validated.
 
+        Returns:
+            os.stat_result: The status of the file, retrieved in a single system call.
+
         Raises:
             FileNotFoundError: If the filepath does not exist.
             TypeError: If the filepath is not a file.
         """
-        if not os.path.exists(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Filepath {path} does not exist.")
-        elif not os.path.isfile(path):
+
+        if not S_ISREG(stat.st_mode):
             raise IsADirectoryError(f"Filepath {path} is not a file.")
+
+        return stat
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "dvuploader",
+    "hashes.sqlite",
+)
+
+
+class HashCache:
+    """
+    Persistent cache of file checksums, stored in an SQLite database.
+
+    Entries are keyed by the path of the file and the hash algorithm. A cached
+    checksum is only returned if size and modification time of the file still
+    match, hence unchanged files do not need to be hashed again.
+
+    Methods:
+        get(path, size, mtime_ns, hash_algo): Returns the cached checksum or None.
+        put(path, size, mtime_ns, hash_algo, value): Stores a checksum.
+        close(): Closes the database connection.
+    """
+
+    def __init__(self, path: str = CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Files are hashed from multiple threads, hence access is serialized
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+
+        # WAL allows concurrent uploader processes to read while one writes
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS hashes (
+                path TEXT NOT NULL,
+                algo TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (path, algo)
+            )
+            """
+        )
+
+    def get(
+        self,
+        path: str,
+        size: int,
+        mtime_ns: int,
+        hash_algo: str,
+    ) -> Optional[str]:
+        """
+        Retrieves a cached checksum.
+
+        Args:
+            path (str): The absolute path of the file.
+            size (int): The current size of the file in bytes.
+            mtime_ns (int): The current modification time of the file in nanoseconds.
+            hash_algo (str): The hash algorithm of the checksum (e.g. "SHA-256").
+
+        Returns:
+            Optional[str]: The checksum, or None if missing or outdated.
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT value FROM hashes
+                WHERE path = ? AND algo = ? AND size = ? AND mtime_ns = ?
+                """,
+                (path, hash_algo, size, mtime_ns),
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def put(
+        self,
+        path: str,
+        size: int,
+        mtime_ns: int,
+        hash_algo: str,
+        value: str,
+    ) -> None:
+        """
+        Stores a checksum, replacing any previous entry of the file.
+
+        Args:
+            path (str): The absolute path of the file.
+            size (int): The size of the file in bytes.
+            mtime_ns (int): The modification time of the file in nanoseconds.
+            hash_algo (str): The hash algorithm of the checksum (e.g. "SHA-256").
+            value (str): The checksum.
+        """
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)",
+                (path, hash_algo, size, mtime_ns, value),
+            )
+
+    def close(self) -> None:
+        """Closes the database connection."""
+
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -1,5 +1,4 @@
 import asyncio
-from io import BytesIO
 import httpx
 import json
 import os
@@ -11,15 +10,13 @@ from rich.progress import Progress, TaskID
 
 from dvuploader.file import File
 from dvuploader.packaging import distribute_files, zip_files
-from dvuploader.utils import build_url, retrieve_dataset_files
+from dvuploader.utils import build_limits, build_url, retrieve_dataset_files
 
 MAX_RETRIES = int(os.environ.get("DVUPLOADER_MAX_RETRIES", 15))
 NATIVE_UPLOAD_ENDPOINT = "/api/datasets/:persistentId/add"
 NATIVE_REPLACE_ENDPOINT = "/api/files/{FILE_ID}/replace"
 NATIVE_METADATA_ENDPOINT = "/api/files/{FILE_ID}/metadata"
 
-assert isinstance(MAX_RETRIES, int), "DVUPLOADER_MAX_RETRIES must be an integer"
-
 
 async def native_upload(
     files: List[File],
@@ -50,7 +47,7 @@ async def native_upload(
         "base_url": dataverse_url,
         "headers": {"X-Dataverse-key": api_token},
         "timeout": None,
-        "limits": httpx.Limits(max_connections=n_parallel_uploads),
+        "limits": build_limits(n_parallel_uploads),
     }
 
     async with httpx.AsyncClient(**session_params) as session:
@@ -128,7 +125,9 @@ def _zip_packages(
                 ),
             )
 
-            file.extract_file_name_hash_file()
+            # The checksum of a package is not part of the native upload
+            # request, hence the zip file is not read a second time for hashing
+            file.extract_file_name()
             file.mimeType = "application/zip"
 
         pbar = progress.add_task(
@@ -155,7 +154,8 @@ def _reset_progress(
         None
     """
 
-    for pbar in pbars:
+    # Files may share an aggregate bar, which is removed only once
+    for pbar in set(pbars):
         progress.remove_task(pbar)
 
 
@@ -200,7 +200,7 @@ async def _single_native_upload(
         "file": (file.file_name, file.handler, file.mimeType),
         "jsonData": (
             None,
-            BytesIO(json.dumps(json_data).encode()),
+            json.dumps(json_data).encode(),
             "application/json",
         ),
     }
@@ -303,13 +303,13 @@ async def _update_single_metadata(
     del json_data["forceReplace"]
     del json_data["restrict"]
 
-    # Send metadata as a readable byte stream
+    # Send metadata as a multipart form part
     # This is a workaround since "data" and "json"
     # does not work
     files = {
         "jsonData": (
             None,
-            BytesIO(json.dumps(json_data).encode()),
+            json.dumps(json_data).encode(),
             "application/json",
         ),
     }
@@ -1,4 +1,6 @@
 import os
+import shutil
+import time
 import zipfile
 
 from typing import List, Tuple
@@ -90,10 +92,16 @@ def zip_files(
 
     with zipfile.ZipFile(path, "w") as zip_file:
         for file in files:
-            zip_file.writestr(
-                data=file.handler.read(),  # type: ignore
-                zinfo_or_arcname=_create_arcname(file),
+            zinfo = zipfile.ZipInfo(
+                filename=_create_arcname(file),  # type: ignore
+                date_time=time.localtime(time.time())[:6],
             )
+            zinfo.external_attr = 0o600 << 16
+            zinfo.file_size = file._size
+
+            # Stream the file into the archive instead of reading it into memory
+            with zip_file.open(zinfo, "w") as dest:
+                shutil.copyfileobj(file.handler, dest)  # type: ignore
 
     return path
 
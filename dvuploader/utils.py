@@ -1,12 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 import pathlib
 import re
-from typing import List
+from typing import Callable, List, Optional
 from urllib.parse import urljoin
 import httpx
 from rich.progress import Progress
 
 from dvuploader.file import File
+from dvuploader.hashcache import HashCache
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+PREWARM_PAGE_CACHE = bool(os.environ.get("DVUPLOADER_PREWARM_PAGE_CACHE", False))
+
+# Idle connections are kept open for this many seconds. httpx defaults to 5s,
+# which drops connections to Dataverse and the storage between files.
+KEEPALIVE_EXPIRY = 30.0
 
 
 def build_url(
@@ -36,6 +49,23 @@ def build_url(
     return f"{endpoint}?{queries}"
 
 
+def build_limits(max_connections: int) -> httpx.Limits:
+    """Builds the connection pool limits for an upload session.
+
+    Args:
+        max_connections (int): The maximum number of concurrent connections.
+
+    Returns:
+        httpx.Limits: Limits keeping every connection of the pool alive between requests.
+    """
+
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
 def retrieve_dataset_files(
     dataverse_url: str,
     persistent_id: str,
@@ -64,7 +94,8 @@ def retrieve_dataset_files(
 
     response.raise_for_status()
 
-    return response.json()["data"]["latestVersion"]["files"]
+    # Listings of large datasets are decoded faster by orjson, if installed
+    return json_loads(response.content)["data"]["latestVersion"]["files"]
 
 
 def add_directory(
@@ -112,6 +143,93 @@ def add_directory(
     return files
 
 
+def hash_files_parallel(
+    files: List[File],
+    max_workers: Optional[int] = None,
+    callback: Optional[Callable[[File], None]] = None,
+    cache: Optional[HashCache] = None,
+) -> List[File]:
+    """
+    Validates and hashes the given files in parallel using a thread pool.
+
+    Threads are sufficient since hashlib releases the GIL while hashing,
+    so the throughput scales with the number of cores until disk bandwidth
+    becomes the limit.
+
+    Args:
+        files (List[File]): The files to validate and hash.
+        max_workers (Optional[int]): The number of worker threads. Defaults to the number of CPUs.
+        callback (Optional[Callable[[File], None]]): Called with each file once it has been hashed.
+        cache (Optional[HashCache]): Cache to skip hashing of unchanged files.
+
+    Returns:
+        List[File]: The hashed files.
+    """
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_hash_file, file, cache) for file in files]
+
+        for future in as_completed(futures):
+            file = future.result()
+
+            if callback is not None:
+                callback(file)
+
+    return files
+
+
+def _hash_file(file: File, cache: Optional[HashCache] = None) -> File:
+    """
+    Validates and hashes a single file. If DVUPLOADER_PREWARM_PAGE_CACHE is set,
+    the kernel is asked to read the whole file ahead first, so that hashing
+    and the subsequent upload are served from the page cache.
+
+    Args:
+        file (File): The file to validate and hash.
+        cache (Optional[HashCache]): Cache to skip hashing of unchanged files.
+
+    Returns:
+        File: The hashed file.
+    """
+
+    if PREWARM_PAGE_CACHE:
+        _prewarm_page_cache(file)
+
+    return file.extract_file_name_hash_file(cache=cache)
+
+
+def _prewarm_page_cache(file: File) -> None:
+    """
+    Advises the kernel to read the given file into the page cache.
+
+    Args:
+        file (File): The file to read ahead. In-memory handlers are skipped.
+    """
+
+    # Files on disk have a handler once their name was extracted, hence
+    # in-memory handlers are told apart by where they were opened
+    in_memory = file.handler is not None and not file._from_disk
+
+    if in_memory or not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        fd = os.open(file.filepath, os.O_RDONLY)
+    except OSError:
+        # Validation and error reporting happen when the file is hashed
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def _truncate_path(path: pathlib.Path, to_remove: pathlib.Path):
     """
     Truncate a path by removing a substring from the beginning.
@@ -0,0 +1,79 @@
+import hashlib
+from io import BytesIO, StringIO
+
+import pytest
+
+from dvuploader.checksum import Checksum, ChecksumTypes, pick_default_checksum
+
+
+class TestChunkChecksum:
+    def test_matches_hashlib(self):
+        # Arrange
+        content = b"Hello, world!" * 100_000
+        handler = BytesIO(content)
+
+        # Act
+        result = Checksum._chunk_checksum(handler=handler, hash_fun=hashlib.md5)
+
+        # Assert
+        assert result == hashlib.md5(content).hexdigest()
+        assert handler.tell() == 0
+
+    def test_raises_on_text_handler(self):
+        # Arrange
+        handler = StringIO("Hello, world!")
+
+        # Act and Assert
+        with pytest.raises(TypeError):
+            Checksum._chunk_checksum(handler=handler, hash_fun=hashlib.md5)
+
+    def test_from_file(self):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        hash_algo, hash_fun = ChecksumTypes.SHA256.value
+
+        # Act
+        with open(fpath, "rb") as handler:
+            checksum = Checksum.from_file(
+                handler=handler,
+                hash_fun=hash_fun,
+                hash_algo=hash_algo,
+            )
+
+        # Assert
+        with open(fpath, "rb") as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+
+        assert checksum.type == "SHA-256"
+        assert checksum.value == expected
+
+
+class TestPickDefaultChecksum:
+    def test_prefers_sha256(self):
+        assert pick_default_checksum({"MD5", "SHA-256"}) == ChecksumTypes.SHA256
+
+    def test_falls_back_to_dataset_algorithm(self):
+        assert pick_default_checksum({"MD5"}) == ChecksumTypes.MD5
+        assert pick_default_checksum({"SHA-1", "MD5"}) == ChecksumTypes.SHA1
+
+    def test_defaults_to_sha256(self):
+        assert pick_default_checksum(set()) == ChecksumTypes.SHA256
+
+
+class TestChunkChecksumFallback:
+    def test_readinto_loop(self, monkeypatch):
+        # Arrange
+        monkeypatch.delattr(hashlib, "file_digest", raising=False)
+        content = b"Hello, world!" * 100_000
+        handler = BytesIO(content)
+
+        # Act
+        result = Checksum._chunk_checksum(
+            handler=handler,
+            hash_fun=hashlib.sha256,
+            blocksize=2**10,
+        )
+
+        # Assert
+        assert result == hashlib.sha256(content).hexdigest()
+        assert handler.tell() == 0
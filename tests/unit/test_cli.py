@@ -1,4 +1,5 @@
 import tempfile
+import pytest
 from typer.testing import CliRunner
 import yaml
 from dvuploader.cli import _parse_yaml_config, app
@@ -8,9 +9,15 @@ runner = CliRunner()
 
 
 class TestParseYAMLConfig:
-    def test_full_input(self):
-        # Assert
-        fpath = "tests/fixtures/cli_input.yaml"
+    @pytest.mark.parametrize(
+        "fpath",
+        [
+            "tests/fixtures/cli_input.yaml",
+            "tests/fixtures/cli_input.json",
+            "tests/fixtures/cli_input_flow.yaml",
+        ],
+    )
+    def test_full_input(self, fpath):
 
         # Act
         cli_input = _parse_yaml_config(fpath)
@@ -1,14 +1,207 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+
+import httpcore
 import httpx
 import pytest
+import tenacity
 from rich.progress import Progress
+import dvuploader.directupload as directupload
 from dvuploader.directupload import (
     _add_files_to_ds,
+    _api_transport,
+    direct_upload,
+    _chunked_upload,
+    _complete_upload,
+    _prepare_registration,
+    _read_chunk,
+    _upload_chunk,
+    _upload_multipart,
+    _upload_singlepart,
     _validate_ticket_response,
 )
 
 from dvuploader.file import File
 
 
+class Test_DirectUpload:
+    @pytest.fixture
+    def mocked_dataverse(self, httpx_mock):
+        # Issues singlepart tickets and accepts every upload and registration
+        httpx_mock.add_response(
+            method="get",
+            url=re.compile(r"https://example.com/api/datasets/:persistentId/uploadurls.*"),
+            json={
+                "data": {
+                    "url": "https://store.example.com/upload",
+                    "storageIdentifier": "s3://bucket:id",
+                }
+            },
+        )
+        httpx_mock.add_response(method="put", url="https://store.example.com/upload")
+        httpx_mock.add_response(
+            method="post",
+            url=re.compile(r"https://example.com/api/datasets/:persistentId/.*Files.*"),
+        )
+
+        return httpx_mock
+
+    @pytest.fixture
+    def upload(self):
+        # Uploads the given fixture files, each with its own progress bar
+        async def upload(names, n_parallel_uploads):
+            fixtures = "tests/fixtures/add_dir_files"
+            files = [
+                File(filepath=os.path.join(fixtures, name)).extract_file_name()
+                for name in names
+            ]
+
+            progress = Progress()
+            pbars = [progress.add_task(file.file_name, total=file._size) for file in files]  # type: ignore
+
+            await direct_upload(
+                files=files,
+                dataverse_url="https://example.com",
+                api_token="token",
+                persistent_id="pid",
+                progress=progress,
+                pbars=pbars,
+                n_parallel_uploads=n_parallel_uploads,
+            )
+
+            return files
+
+        return upload
+
+    # Should upload every file once with a bounded number of workers
+    @pytest.mark.asyncio
+    async def test_uploads_all_files(self, mocked_dataverse, upload):
+        # Act
+        files = await upload(
+            ["somefile.txt", "anotherfile.txt", "to_ignore.txt"],
+            n_parallel_uploads=2,
+        )
+
+        # Assert
+        puts = [
+            request
+            for request in mocked_dataverse.get_requests()
+            if request.method == "PUT"
+        ]
+
+        assert len(puts) == len(files)
+        assert all(file.storageIdentifier == "s3://bucket:id" for file in files)
+
+    # Should request a new ticket if the prefetched one is too old to be used
+    @pytest.mark.asyncio
+    async def test_renews_stale_tickets(self, mocked_dataverse, upload, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(directupload, "TICKET_MAX_AGE", -1.0)
+
+        # Act
+        files = await upload(["somefile.txt", "anotherfile.txt"], n_parallel_uploads=1)
+
+        # Assert
+        tickets = [
+            request
+            for request in mocked_dataverse.get_requests()
+            if request.method == "GET"
+        ]
+
+        assert len(tickets) == 2 * len(files)
+
+    # Should discard the prefetched ticket if the upload of a previous file fails
+    @pytest.mark.asyncio
+    async def test_discards_prefetched_ticket_on_failure(self, httpx_mock, upload):
+        # Arrange
+        httpx_mock.add_response(
+            method="get",
+            url=re.compile(r"https://example.com/api/datasets/:persistentId/uploadurls.*size=14.*"),
+            json={
+                "data": {
+                    "url": "https://store.example.com/upload",
+                    "storageIdentifier": "s3://bucket:first",
+                }
+            },
+        )
+        httpx_mock.add_response(
+            method="get",
+            url=re.compile(r"https://example.com/api/datasets/:persistentId/uploadurls.*size=20.*"),
+            json={
+                "data": {
+                    "urls": {"1": "https://store.example.com/part1"},
+                    "abort": "/api/datasets/mpupload?uploadid=second",
+                    "complete": "/api/datasets/mpupload?uploadid=second",
+                    "partSize": 1024,
+                    "storageIdentifier": "s3://bucket:second",
+                }
+            },
+        )
+
+        async def reject_upload(request: httpx.Request):
+            # Gives the prefetched ticket request time to finish
+            await asyncio.sleep(0.05)
+            return httpx.Response(status_code=403)
+
+        httpx_mock.add_callback(
+            reject_upload,
+            method="put",
+            url="https://store.example.com/upload",
+        )
+        httpx_mock.add_response(
+            method="delete",
+            url="https://example.com/api/datasets/mpupload?uploadid=second",
+        )
+
+        # Act
+        with pytest.raises(httpx.HTTPStatusError):
+            await upload(["somefile.txt", "anotherfile.txt"], n_parallel_uploads=1)
+
+        # Assert
+        aborts = [
+            request
+            for request in httpx_mock.get_requests()
+            if request.method == "DELETE"
+        ]
+
+        assert len(aborts) == 1
+
+
+class Test_ApiTransport:
+    @pytest.fixture(autouse=True)
+    def clear_proxies(self, monkeypatch):
+        for name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+            monkeypatch.delenv(name, raising=False)
+            monkeypatch.delenv(name.upper(), raising=False)
+
+    # Should route Dataverse API requests through the proxy of the environment
+    def test_uses_environment_proxy(self, monkeypatch):
+        # Arrange
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example.com:3128")
+
+        # Act
+        transport = _api_transport("https://example.com", 1)
+
+        # Assert
+        assert isinstance(transport._pool, httpcore.AsyncHTTPProxy)
+
+    # Should connect directly to hosts excluded via NO_PROXY
+    def test_respects_no_proxy(self, monkeypatch):
+        # Arrange
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example.com:3128")
+        monkeypatch.setenv("NO_PROXY", "example.com")
+
+        # Act
+        transport = _api_transport("https://example.com", 1)
+
+        # Assert
+        assert not isinstance(transport._pool, httpcore.AsyncHTTPProxy)
+
+
 class Test_AddFileToDs:
     # Should successfully add files to a Dataverse dataset with a valid file path
     @pytest.mark.asyncio
@@ -25,24 +218,504 @@ class Test_AddFileToDs:
         )
 
         # Initialize the necessary variables
-        session = httpx.AsyncClient()
-        dataverse_url = "https://example.com"
+        session = httpx.AsyncClient(base_url="https://example.com")
         pid = "pid"
         fpath = "tests/fixtures/add_dir_files/somefile.txt"
-        files = [File(filepath=fpath)]
+        files = [
+            File(filepath=fpath),
+            File(filepath=fpath, to_replace=True, file_id=1),
+        ]
         progress = Progress()
         pbar = progress.add_task("Uploading", total=1)
 
         # Invoke the function
         await _add_files_to_ds(
             session=session,
-            dataverse_url=dataverse_url,
+            api_token="token",
             pid=pid,
             files=files,
             progress=progress,
             pbar=pbar,
         )
 
+        # Assert
+        requests = httpx_mock.get_requests()
+
+        assert len(requests) == 2
+
+        for request in requests:
+            assert request.headers["X-Dataverse-key"] == "token"
+
+    # Should not register an empty list of files to replace
+    @pytest.mark.asyncio
+    async def test_skips_empty_registration(self, httpx_mock):
+        # Arrange
+        httpx_mock.add_response(
+            method="post",
+            url="https://example.com/api/datasets/:persistentId/addFiles?persistentId=pid",
+        )
+
+        session = httpx.AsyncClient(base_url="https://example.com")
+        files = [File(filepath="tests/fixtures/add_dir_files/somefile.txt")]
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=1)
+
+        # Act
+        await _add_files_to_ds(
+            session=session,
+            api_token="token",
+            pid="pid",
+            files=files,
+            progress=progress,
+            pbar=pbar,
+        )
+
+        # Assert
+        assert len(httpx_mock.get_requests()) == 1
+
+
+class Test_UploadSinglepart:
+    # Should send the raw file content instead of a multipart form
+    @pytest.mark.asyncio
+    async def test_streams_raw_file_content(self, httpx_mock):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        url = "https://example.com/upload"
+        ticket = {"url": url, "storageIdentifier": "s3://bucket:id"}
+
+        with open(fpath, "rb") as f:
+            content = f.read()
+
+        bodies = []
+
+        # The body is streamed while the request is sent, hence read it there
+        async def read_body(request: httpx.Request):
+            bodies.append(await request.aread())
+            return httpx.Response(200)
+
+        httpx_mock.add_callback(read_body, method="put", url=url)
+
+        file = File(filepath=fpath).extract_file_name()
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=len(content))
+
+        # Act
+        async with httpx.AsyncClient() as session:
+            status, storage_identifier = await _upload_singlepart(
+                session=session,
+                ticket=ticket,
+                file=file,
+                pbar=pbar,
+                progress=progress,
+            )
+
+        # Assert
+        request = httpx_mock.get_request()
+
+        assert status is True
+        assert storage_identifier == "s3://bucket:id"
+        assert bodies == [content]
+        assert request.headers["Content-Length"] == str(len(content))
+        assert "X-Dataverse-key" not in request.headers
+
+    # Should send the file again after a transient server error
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self, httpx_mock, monkeypatch):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        url = "https://example.com/upload"
+        ticket = {"url": url, "storageIdentifier": "s3://bucket:id"}
+
+        with open(fpath, "rb") as f:
+            content = f.read()
+
+        responses = iter([503, 200])
+        bodies = []
+
+        async def read_body(request: httpx.Request):
+            bodies.append(await request.aread())
+            return httpx.Response(next(responses))
+
+        monkeypatch.setattr(_upload_singlepart.retry, "wait", tenacity.wait_none())  # type: ignore
+        httpx_mock.add_callback(read_body, method="put", url=url)
+
+        file = File(filepath=fpath).extract_file_name()
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=len(content))
+
+        # Act
+        async with httpx.AsyncClient() as session:
+            status, _ = await _upload_singlepart(
+                session=session,
+                ticket=ticket,
+                file=file,
+                pbar=pbar,
+                progress=progress,
+            )
+
+        # Assert
+        assert status is True
+        assert bodies == [content, content]
+        assert progress.tasks[0].completed == len(content)
+
+
+class Test_UploadMultipart:
+    # Should abort a cancelled upload once, without retries or a failure message
+    @pytest.mark.asyncio
+    async def test_aborts_cancelled_upload_once(self, httpx_mock, capsys):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        ticket = {
+            "urls": {"1": "https://example.com/part/1"},
+            "abort": "https://example.com/abort",
+            "complete": "https://example.com/complete",
+            "partSize": 1024,
+            "storageIdentifier": "s3://bucket:id",
+        }
+
+        started = asyncio.Event()
+
+        async def stall_upload(request: httpx.Request):
+            started.set()
+            await asyncio.Event().wait()
+
+        httpx_mock.add_callback(stall_upload, method="put", url=ticket["urls"]["1"])
+        httpx_mock.add_response(method="delete", url=ticket["abort"], status_code=503)
+
+        file = File(filepath=fpath).extract_file_name()
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=file._size)  # type: ignore
+
+        # Act
+        async with httpx.AsyncClient() as session:
+            upload = asyncio.ensure_future(
+                _upload_multipart(
+                    session=session,
+                    response=ticket,
+                    file=file,
+                    pbar=pbar,
+                    progress=progress,
+                    api_token="token",
+                    n_parallel_uploads=1,
+                )
+            )
+
+            await started.wait()
+            upload.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await upload
+
+        # Assert
+        aborts = [
+            request
+            for request in httpx_mock.get_requests()
+            if request.method == "DELETE"
+        ]
+
+        assert len(aborts) == 1
+        assert "Failed" not in capsys.readouterr().out
+
+
+class Test_UploadChunk:
+    # Should stream the requested slice of the file and return the ETag
+    @pytest.mark.asyncio
+    async def test_streams_file_slice(self, httpx_mock):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        url = "https://example.com/part/2"
+
+        with open(fpath, "rb") as f:
+            content = f.read()
+
+        bodies = []
+
+        # The body is streamed while the request is sent, hence read it there
+        async def read_body(request: httpx.Request):
+            bodies.append(await request.aread())
+            return httpx.Response(200, headers={"ETag": "etag"})
+
+        httpx_mock.add_callback(read_body, method="put", url=url)
+
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=len(content))
+
+        # Act
+        with open(fpath, "rb") as f:
+            async with httpx.AsyncClient() as session:
+                e_tag = await _upload_chunk(
+                    session=session,
+                    url=url,
+                    fd=f.fileno(),
+                    offset=2,
+                    size=3,
+                    pbar=pbar,
+                    progress=progress,
+                    semaphore=asyncio.Semaphore(1),
+                )
+
+            request = httpx_mock.get_request()
+
+        # Assert
+        assert e_tag == "etag"
+        assert bodies == [content[2:5]]
+        assert request.headers["Content-Length"] == "3"
+        assert "Transfer-Encoding" not in request.headers
+        assert progress.tasks[0].completed == 3
+
+    # Should send the chunk again after a transient server error
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self, httpx_mock, monkeypatch):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        url = "https://example.com/part/1"
+
+        monkeypatch.setattr(_upload_chunk.retry, "wait", tenacity.wait_none())  # type: ignore
+        httpx_mock.add_response(method="put", url=url, status_code=503)
+        httpx_mock.add_response(method="put", url=url, headers={"ETag": "etag"})
+
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=3)
+
+        # Act
+        with open(fpath, "rb") as f:
+            async with httpx.AsyncClient() as session:
+                e_tag = await _upload_chunk(
+                    session=session,
+                    url=url,
+                    fd=f.fileno(),
+                    offset=0,
+                    size=3,
+                    pbar=pbar,
+                    progress=progress,
+                    semaphore=asyncio.Semaphore(1),
+                )
+
+        # Assert
+        assert e_tag == "etag"
+        assert len(httpx_mock.get_requests()) == 2
+
+    # Should not retry client errors
+    @pytest.mark.asyncio
+    async def test_raises_client_errors(self, httpx_mock):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        url = "https://example.com/part/1"
+
+        httpx_mock.add_response(method="put", url=url, status_code=403)
+
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=3)
+
+        # Act & Assert
+        with open(fpath, "rb") as f:
+            async with httpx.AsyncClient() as session:
+                with pytest.raises(httpx.HTTPStatusError):
+                    await _upload_chunk(
+                        session=session,
+                        url=url,
+                        fd=f.fileno(),
+                        offset=0,
+                        size=3,
+                        pbar=pbar,
+                        progress=progress,
+                        semaphore=asyncio.Semaphore(1),
+                    )
+
+        assert len(httpx_mock.get_requests()) == 1
+
+    # Should compare the returned ETag with the MD5 of the sent bytes
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("matches", [True, False])
+    async def test_verifies_etag(self, httpx_mock, monkeypatch, matches):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        url = "https://example.com/part/1"
+
+        with open(fpath, "rb") as f:
+            expected = hashlib.md5(f.read()[:3]).hexdigest()
+
+        async def respond(request: httpx.Request):
+            body = await request.aread()
+            e_tag = hashlib.md5(body if matches else b"other").hexdigest()
+            return httpx.Response(200, headers={"ETag": f'"{e_tag}"'})
+
+        monkeypatch.setattr(directupload, "VERIFY_ETAGS", True)
+        httpx_mock.add_callback(respond, method="put", url=url)
+
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=3)
+
+        # Act
+        with open(fpath, "rb") as f:
+            async with httpx.AsyncClient() as session:
+                upload = _upload_chunk(
+                    session=session,
+                    url=url,
+                    fd=f.fileno(),
+                    offset=0,
+                    size=3,
+                    pbar=pbar,
+                    progress=progress,
+                    semaphore=asyncio.Semaphore(1),
+                )
+
+                # Assert
+                if matches:
+                    assert await upload == f'"{expected}"'
+                else:
+                    with pytest.raises(ValueError):
+                        await upload
+
+
+class Test_ReadChunk:
+    # Should wait for the block read ahead when closed, since the file is closed afterwards
+    @pytest.mark.asyncio
+    async def test_waits_for_read_ahead_on_close(self, monkeypatch):
+        # Arrange
+        finished = []
+
+        def slow_read(fd, size, offset, digest=None):
+            time.sleep(0.05)
+            finished.append(offset)
+            return b"x" * size
+
+        monkeypatch.setattr(directupload, "_read_block", slow_read)
+        monkeypatch.setattr(directupload, "CHUNK_READ_SIZE", 1)
+
+        chunk = _read_chunk(fd=0, offset=0, size=4, advance=lambda n_bytes: None)
+
+        # Act
+        first = await chunk.__anext__()
+        await chunk.aclose()
+
+        # Assert
+        assert first == b"x"
+        assert finished == [0, 1]
+
+
+class Test_ChunkedUpload:
+    # Should upload all chunks and return the ETags in the order of the parts
+    @pytest.mark.asyncio
+    async def test_etags_keep_part_order(self, httpx_mock):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        size = os.path.getsize(fpath)
+        urls = [f"https://example.com/part/{index}" for index in range(1, 6)]
+
+        for index, url in enumerate(urls, 1):
+            httpx_mock.add_response(
+                method="put",
+                url=url,
+                headers={"ETag": f"etag-{index}"},
+            )
+
+        file = File(filepath=fpath).extract_file_name()
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=size)
+
+        # Act
+        async with httpx.AsyncClient() as session:
+            e_tags = await _chunked_upload(
+                file=file,
+                session=session,
+                urls=urls,
+                chunk_size=3,
+                pbar=pbar,
+                progress=progress,
+                n_parallel_uploads=2,
+            )
+
+        # Assert
+        assert e_tags == [f"etag-{index}" for index in range(1, 6)]
+
+    # Should refuse to upload a file whose ticket lacks part URLs
+    @pytest.mark.asyncio
+    async def test_raises_on_missing_part_urls(self):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        size = os.path.getsize(fpath)
+        urls = [f"https://example.com/part/{index}" for index in range(1, 3)]
+
+        file = File(filepath=fpath).extract_file_name()
+        progress = Progress()
+        pbar = progress.add_task("Uploading", total=size)
+
+        # Act & Assert
+        async with httpx.AsyncClient() as session:
+            with pytest.raises(ValueError):
+                await _chunked_upload(
+                    file=file,
+                    session=session,
+                    urls=urls,
+                    chunk_size=3,
+                    pbar=pbar,
+                    progress=progress,
+                    n_parallel_uploads=2,
+                )
+
+
+class Test_CompleteUpload:
+    # Should send the ETags again after a transient server error
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self, httpx_mock, monkeypatch):
+        # Arrange
+        url = "https://example.com/complete"
+
+        monkeypatch.setattr(_complete_upload.retry, "wait", tenacity.wait_none())  # type: ignore
+        httpx_mock.add_response(method="put", url=url, status_code=502)
+        httpx_mock.add_response(method="put", url=url)
+
+        # Act
+        async with httpx.AsyncClient() as session:
+            await _complete_upload(
+                session=session,
+                url=url,
+                e_tags=["a", "b"],
+                api_token="token",
+            )
+
+        # Assert
+        requests = httpx_mock.get_requests()
+
+        assert len(requests) == 2
+        assert json.loads(requests[-1].content) == {"1": "a", "2": "b"}
+
+
+class Test_PrepareRegistration:
+    # Should serialize the files of the requested kind as model_dump does
+    def test_matches_model_dump(self):
+        # Arrange
+        novel = File(filepath="tests/fixtures/add_dir_files/somefile.txt")
+        replace = File(
+            filepath="tests/fixtures/add_dir_files/anotherfile.txt",
+            to_replace=True,
+            file_id=1,
+        )
+
+        novel.extract_file_name()
+        replace.extract_file_name()
+
+        # Act
+        novel_data = _prepare_registration([novel], use_replace=False)
+        replace_data = _prepare_registration([replace], use_replace=True)
+
+        # Assert
+        assert json.loads(novel_data) == [
+            novel.model_dump(
+                by_alias=True,
+                exclude={"to_replace", "file_id"},
+                exclude_none=True,
+            )
+        ]
+        assert json.loads(replace_data) == [
+            replace.model_dump(
+                by_alias=True,
+                exclude={"to_replace"},
+                exclude_none=True,
+            )
+        ]
+
 
 class Test_ValidateTicketResponse:
     # Function does not raise any exceptions when all necessary fields are present
@@ -56,16 +729,16 @@ class Test_ValidateTicketResponse:
         }
         try:
             _validate_ticket_response(response)
-        except AssertionError:
-            pytest.fail("AssertionError raised when all necessary fields are present")
+        except KeyError:
+            pytest.fail("KeyError raised when all necessary fields are present")
 
-    # Function raises AssertionError when 'abort' field is missing
-    def test_raises_assertion_error_when_abort_field_missing(self):
+    # Function raises KeyError when 'abort' field is missing
+    def test_raises_key_error_when_abort_field_missing(self):
         response = {
             "complete": "complete_url",
             "partSize": 100,
             "urls": {"url1": "url1", "url2": "url2"},
             "storageIdentifier": "storage_id",
         }
-        with pytest.raises(AssertionError):
+        with pytest.raises(KeyError, match="abort"):
             _validate_ticket_response(response)
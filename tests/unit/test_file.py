@@ -1,3 +1,7 @@
+import hashlib
+import os
+from io import BytesIO, StringIO
+
 import pytest
 from dvuploader.file import File
 
@@ -18,6 +22,35 @@ class TestFile:
         # Assert
         assert file.file_name == "somefile.txt"
 
+    def test_extract_file_name_without_hashing(self):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+
+        # Act
+        file = File(filepath=fpath)
+        file.extract_file_name()
+
+        # Assert
+        assert file.file_name == "somefile.txt"
+        assert file.checksum is None
+        assert file._size == os.path.getsize(fpath)
+
+    def test_hash_file_keeps_upload_handler_position(self):
+        # Arrange
+        fpath = "tests/fixtures/add_dir_files/somefile.txt"
+        file = File(filepath=fpath).extract_file_name()
+        file.handler.read(3)  # type: ignore
+
+        # Act
+        file.hash_file()
+
+        # Assert
+        with open(fpath, "rb") as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+
+        assert file.checksum.value == expected  # type: ignore
+        assert file.handler.tell() == 3  # type: ignore
+
     def test_read_non_existent_file(self):
         # Arrange
         fpath = "tests/fixtures/add_dir_files/non_existent.txt"
@@ -43,3 +76,20 @@ class TestFile:
             )
 
             file.extract_file_name_hash_file()
+
+    def test_read_text_handler(self):
+        # Arrange
+        handler = StringIO("Hello, world!")
+
+        # Act
+        file = File(
+            filepath="test.txt",
+            handler=handler,
+        )
+
+        file.extract_file_name_hash_file()
+
+        # Assert
+        assert isinstance(file.handler, BytesIO)
+        assert file._size == len("Hello, world!")
+        assert file.checksum.value == hashlib.sha256(b"Hello, world!").hexdigest()  # type: ignore
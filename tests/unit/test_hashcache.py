@@ -0,0 +1,54 @@
+import os
+import tempfile
+
+from dvuploader.checksum import Checksum
+from dvuploader.file import File
+from dvuploader.hashcache import HashCache
+
+
+class TestHashCache:
+    def test_put_and_get(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            cache = HashCache(os.path.join(tmp_dir, "hashes.sqlite"))
+
+            # Act
+            cache.put(
+                path="/data/file.txt",
+                size=10,
+                mtime_ns=100,
+                hash_algo="SHA-256",
+                value="abc",
+            )
+
+            # Assert
+            assert cache.get("/data/file.txt", 10, 100, "SHA-256") == "abc"
+            assert cache.get("/data/file.txt", 10, 100, "MD5") is None
+            assert cache.get("/data/file.txt", 11, 100, "SHA-256") is None
+            assert cache.get("/data/file.txt", 10, 101, "SHA-256") is None
+
+            cache.close()
+
+    def test_file_uses_cached_checksum(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            cache = HashCache(os.path.join(tmp_dir, "hashes.sqlite"))
+            fpath = "tests/fixtures/add_dir_files/somefile.txt"
+
+            file = File(filepath=fpath)
+            file.extract_file_name_hash_file(cache=cache)
+            expected = file.checksum
+
+            def fail(*args, **kwargs):
+                raise AssertionError("File should not be hashed again")
+
+            monkeypatch.setattr(Checksum, "from_file", fail)
+
+            # Act
+            cached_file = File(filepath=fpath)
+            cached_file.extract_file_name_hash_file(cache=cache)
+
+            # Assert
+            assert cached_file.checksum == expected
+
+            cache.close()
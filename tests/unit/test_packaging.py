@@ -0,0 +1,32 @@
+import tempfile
+import zipfile
+
+from dvuploader.packaging import zip_files
+from dvuploader.utils import add_directory
+
+
+class TestZipFiles:
+    def test_zips_files_with_directory_labels(self):
+        # Arrange
+        files = add_directory("tests/fixtures/add_dir_files")
+        [file.extract_file_name() for file in files]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Act
+            path = zip_files(files=files, tmp_dir=tmp_dir, index=0)
+
+            # Assert
+            with zipfile.ZipFile(path) as zip_file:
+                assert zip_file.testzip() is None
+                assert sorted(zip_file.namelist()) == sorted(
+                    [
+                        "somefile.txt",
+                        "anotherfile.txt",
+                        "to_ignore.txt",
+                        "subdir/subfile.txt",
+                        "__to_ignore_dir__/subfile_in_ignore.txt",
+                    ]
+                )
+
+                with open("tests/fixtures/add_dir_files/subdir/subfile.txt", "rb") as f:
+                    assert zip_file.read("subdir/subfile.txt") == f.read()
@@ -1,4 +1,5 @@
 from io import BytesIO
+import os
 import pytest
 import httpx
 
@@ -7,6 +8,7 @@ from dvuploader.file import File
 from dvuploader.utils import (
     add_directory,
     build_url,
+    hash_files_parallel,
     retrieve_dataset_files,
     setup_pbar,
 )
@@ -71,6 +73,56 @@ class TestAddDirectory:
             ), f"File {file_name} has wrong directory label"
 
 
+class TestHashFilesParallel:
+    def test_all_files_hashed(self):
+        # Arrange
+        files = add_directory("tests/fixtures/add_dir_files")
+        hashed = []
+
+        # Act
+        result = hash_files_parallel(files, max_workers=4, callback=hashed.append)
+
+        # Assert
+        assert result is files
+        assert len(hashed) == len(files)
+        assert all(file.checksum is not None for file in files)
+        assert all(file.file_name is not None for file in files)
+
+    @pytest.mark.skipif(
+        not hasattr(os, "posix_fadvise"),
+        reason="posix_fadvise is not available",
+    )
+    def test_all_files_hashed_with_prewarm(self, monkeypatch):
+        # Arrange
+        advised = []
+
+        def posix_fadvise(fd, offset, length, advice):
+            advised.append(advice)
+
+        monkeypatch.setattr("dvuploader.utils.PREWARM_PAGE_CACHE", True)
+        monkeypatch.setattr("dvuploader.utils.os.posix_fadvise", posix_fadvise)
+        files = add_directory("tests/fixtures/add_dir_files")
+
+        # Handlers of files on disk are opened before hashing during upload
+        for file in files:
+            file.extract_file_name()
+
+        # Act
+        hash_files_parallel(files)
+
+        # Assert
+        assert all(file.checksum is not None for file in files)
+        assert advised.count(os.POSIX_FADV_WILLNEED) == len(files)
+
+    def test_raises_on_missing_file(self):
+        # Arrange
+        files = [File(filepath="tests/fixtures/add_dir_files/non_existent.txt")]
+
+        # Act and Assert
+        with pytest.raises(FileNotFoundError):
+            hash_files_parallel(files)
+
+
 class TestBuildUrl:
     # Returns the endpoint if no query parameters are provided
     def test_returns_endpoint_if_no_query_parameters(self):